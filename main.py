@@ -4,13 +4,17 @@ Calls modular OOP classes for preprocessing, feature engineering, etc.
 
 """
 
+import logging
 import pandas as pd
 from src.components.data_preprocessing import DataPreprocessor
 
+# Pipeline modules log through module-level loggers; set DEBUG for per-column details
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 # STEP 1: Data Preprocessing
 print("\n=== Step 1: Data Preprocessing ===")
-preprocessor = DataPreprocessor("data/raw/energy_data_set.csv")
-preprocessor.run_all("data/processed/processed_energy_data_set.csv")
+preprocessor = DataPreprocessor("data/raw/energy_data_set.csv", cache_dir="cache")
+preprocessor.run_all("data/processed/processed_energy_data_set.parquet")
 
 
 
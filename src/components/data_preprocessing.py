@@ -2,24 +2,48 @@
 DataPreprocessor class for loading, cleaning, and scaling the energy dataset.
 - Handles missing values (forward fill for time series)
 - Caps outliers in the target variable ('Appliances') using the IQR method
-- Scales all numeric features (except target and capped target) using StandardScaler
-- Saves the processed DataFrame to the data/raw/ directory
+- Scales all float features (except target and capped target) to zero mean, unit variance
+- Saves the processed DataFrame as Parquet (default, load with pd.read_parquet) or CSV
+
+Float features are held as float32 (ample for sensor readings and half the
+memory traffic of float64); downstream ML code should consume float32.
 
 """
 
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing  import StandardScaler
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import hashlib
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
+
+def _ffill_2d(a):
+    """
+    Forward-fill NaNs down each column of a 2-D float array.
+    Each cell takes the value of the last non-NaN row above it; leading NaNs stay NaN.
+    """
+    mask = np.isnan(a)
+    idx = np.where(~mask, np.arange(a.shape[0])[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    return a[idx, np.arange(a.shape[1])[None, :]]
+
+
 class DataPreprocessor:
-    def __init__(self, file_path):
+    def __init__(self, file_path, cache_dir=None):
         """
         Initialize the preprocessor and loads the data from CSV.
         Args:
             file_path(str): path to the csv file
+            cache_dir(str): directory for cached scaling statistics (None disables caching)
         """
         self.file_path = file_path
+        self.cache_dir = cache_dir
+        self._initial_nulls = None  # per-column NaN counts from the first scan
+        self._filled = False  # set once handle_missing_values has run
         self.df = self.load_data()
 
     def load_data(self):
@@ -29,24 +53,109 @@ class DataPreprocessor:
             pd.DataFrame:  Loaded DataFrame
 
         """
-        df = pd.read_csv(self.file_path)
-        df['date'] = pd.to_datetime(df['date'])
+        # Arrow's multithreaded parser types the date column while reading,
+        # so no second pd.to_datetime pass over the column is needed.
+        # The integer columns are pinned so blank cells or short files can't change their type.
+        integer_cols = {'Appliances': pa.int64(), 'lights': pa.int64()}
+        table = pacsv.read_csv(
+            self.file_path,
+            read_options=pacsv.ReadOptions(use_threads=True, block_size=8 << 20),
+            convert_options=pacsv.ConvertOptions(
+                timestamp_parsers=['%Y-%m-%d %H:%M:%S'],
+                column_types={'date': pa.timestamp('s'), **integer_cols},
+            ),
+        )
+        # Classify columns once here from the schema; scale_features reuses this list
+        self._numeric_float_cols = [
+            name for name in table.column_names
+            if name != 'date' and name not in integer_cols
+        ]
+        df = table.to_pandas(split_blocks=True, self_destruct=True)
         df.set_index('date', inplace=True)
-        print("Data loaded. Shape:", df.shape)
+        df = df.astype({col: np.float32 for col in df.select_dtypes('float64').columns})
+        for col in df.select_dtypes('integer').columns:
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+        self._cache_path = self._stats_cache_path() if self.cache_dir else None
+        # Cached stats are post-fill values; they are only used once the fill has run
+        self._cached_stats = self._load_cached_stats()
+        self._stats = self._feature_stats(df) if self._cached_stats is None else None
+        logger.info("Data loaded. Shape: %s", df.shape)
         return df
+
+    def _feature_stats(self, df):
+        """
+        Mean and population std of the float features, accumulated in float64.
+        NaNs are skipped (as StandardScaler does), so they stay NaN after scaling.
+        Returns:
+            pd.DataFrame: rows 'mean' and 'std', one column per feature
+        """
+        arr = df[self._numeric_float_cols].to_numpy()
+        return pd.DataFrame(
+            [np.nanmean(arr, axis=0, dtype=np.float64), np.nanstd(arr, axis=0, dtype=np.float64)],
+            index=['mean', 'std'],
+            columns=self._numeric_float_cols,
+        )
+
+    def _stats_cache_path(self):
+        # Cache file keyed by the input's first MiB, size and mtime
+        st = os.stat(self.file_path)
+        h = hashlib.sha256()
+        with open(self.file_path, 'rb') as f:
+            h.update(f.read(1 << 20))
+        h.update(f"{st.st_size}:{st.st_mtime_ns}".encode())
+        return os.path.join(self.cache_dir, h.hexdigest() + '.npz')
+
+    def _load_cached_stats(self):
+        # Returns the post-fill (mu, sigma) saved by a previous run on the same input, or None
+        if self._cache_path is None or not os.path.exists(self._cache_path):
+            return None
+        with np.load(self._cache_path) as cached:
+            if 'filled' not in cached or not cached['filled']:
+                return None
+            if cached['cols'].tolist() != self._numeric_float_cols:
+                return None
+            return pd.DataFrame(
+                [cached['mu'], cached['sd']],
+                index=['mean', 'std'],
+                columns=self._numeric_float_cols,
+            )
+
+    def _save_cached_stats(self):
+        # Persists the post-fill (mu, sigma) used for scaling, for warm reruns and inference
+        if self._cache_path is None or not self._filled:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        np.savez(
+            self._cache_path,
+            mu=self._stats.loc['mean'].to_numpy(),
+            sd=self._stats.loc['std'].to_numpy(),
+            cols=np.array(self._numeric_float_cols),
+            filled=True,
+        )
     
     def detect_missing_values(self):
-        # Prints  & return the number of missing values per column.
-        missing_values = self.df.isnull().sum()
-        print("\nMissing values per column:\n", missing_values)
+        # Logs (at DEBUG) & return the number of missing values per column.
+        missing_values = self.df.isna().sum()
+        if self._initial_nulls is None:
+            self._initial_nulls = missing_values
+        logger.debug("Missing values per column:\n%s", missing_values)
         return missing_values
     
     def handle_missing_values(self):
         # Handles missing values using forward fill('ffill) which is best for time series.
-        print("\nHandling missing values using forward fill('ffill'):")
-        self.df.ffill(inplace=True)
-        print("Missing value handling complete.")
-        self.detect_missing_values()
+        logger.info("Handling missing values using forward fill('ffill')")
+        self._filled = True
+        if self._initial_nulls is not None and not self._initial_nulls.any():
+            logger.info("No missing values to fill.")
+            return
+        # Only float columns can hold NaN; fill them as one NumPy block
+        float_cols = self.df.select_dtypes('float').columns
+        self.df[float_cols] = _ffill_2d(self.df[float_cols].to_numpy())
+        self._stats = None  # values changed; scale_features recomputes the stats
+        # ffill can only leave NaNs in leading rows, so checking the first row
+        # is enough to find columns that are still missing values.
+        remaining = int(self.df.iloc[0].isna().sum())
+        logger.info("Missing value handling complete. Columns with leading NaNs left: %d", remaining)
 
     def handle_outliers(self):
         """
@@ -54,72 +163,122 @@ class DataPreprocessor:
         Creates a new column '<column>'_capped
 
         """
-        q1 = self.df['Appliances'].quantile(0.25)
-        q3 = self.df['Appliances'].quantile(0.75)
+        # One linear-time selection yields min, both quartiles and max of the column
+        a = self.df['Appliances'].to_numpy()
+        # A blank cell makes the column float; skip NaNs like pandas' quantile/min/max
+        valid = a[~np.isnan(a)] if a.dtype.kind == 'f' else a
+        n = valid.size
+        k1, k3 = n // 4, 3 * n // 4
+        p = np.partition(valid, [0, k1, k3, n - 1])
+        before_min, q1, q3, before_max = p[0], p[k1], p[k3], p[n - 1]  # Before capping outliers
 
         iqr = q3 - q1
 
         lower_bound = q1 - 1.5 * iqr
         upper_bound = q3 + 1.5 * iqr
 
-        before_min = self.df['Appliances'].min()  # Min before capping outliers
-        before_max = self.df['Appliances'].max()  # Max before capping outliers
+        capped = np.empty(a.shape, dtype=np.float32)
+        np.clip(a, lower_bound, upper_bound, out=capped)
+        self.df['Appliances_capped'] = capped
 
-        self.df['Appliances_capped']  = self.df['Appliances'].clip(lower=lower_bound, upper=upper_bound)
+        # Clipping is monotonic, so the capped extremes follow from the originals
+        after_min = float(np.clip(before_min, lower_bound, upper_bound))
+        after_max = float(np.clip(before_max, lower_bound, upper_bound))
 
-        after_min = self.df['Appliances_capped'].min() # Min after capped the outliers
-        after_max = self.df['Appliances_capped'].max() # Max after capped the outliers
-
-        print(f"\nCapped 'Appliances_capped' outliers at [{lower_bound:.2f}, {upper_bound:.2f}].")
-        print(f"\nBefore capping: min={before_min}, max={before_max}")
-        print(f"\nAfter capping: min={after_min}, max={after_max}")
+        logger.info("Capped 'Appliances_capped' outliers at [%.2f, %.2f].", lower_bound, upper_bound)
+        logger.info("Before capping: min=%s, max=%s", before_min, before_max)
+        logger.info("After capping: min=%s, max=%s", after_min, after_max)
 
     def scale_features(self):
         """
-        Scale specific columns using StandardScaler.
+        Standardize the float sensor features to zero mean and unit variance.
+        Integer-valued columns (e.g. 'lights') and the target are left unscaled.
         Creates new columns with '_scaled' suffix.
 
         """
-        # Select all numeric columns except 'Appliances' and 'Appliances_capped'
-        exclude_cols = ['Appliances', 'Appliances_capped']
-        numeric_cols = [
-            col for col in self.df.columns
-            if pd.api.types.is_numeric_dtype(self.df[col]) and col not in exclude_cols
-        ]
+        numeric_cols = self._numeric_float_cols
 
-        scaler = StandardScaler()
-        scaled_values = scaler.fit_transform(self.df[numeric_cols])
+        # Reuse the cached (post-fill only) or load-time mean/std unless a fill
+        # has changed the values
+        if self._filled and self._cached_stats is not None:
+            self._stats = self._cached_stats
+        elif self._stats is None:
+            self._stats = self._feature_stats(self.df)
+        if self._filled and self._cached_stats is None:
+            self._save_cached_stats()
+            self._cached_stats = self._stats
+        mu = self._stats.loc['mean', numeric_cols].to_numpy()
+        sd = self._stats.loc['std', numeric_cols].to_numpy(copy=True)
+        sd[sd == 0] = 1
 
-        for i, col in enumerate(numeric_cols):
-            self.df[col  + '_scaled'] = scaled_values[:, i]
-        print(f"\nScaled columns: {numeric_cols} (zero mean unit variance)")
+        # One broadcast over the whole (rows, cols) matrix; constant columns keep sd=1.
+        # The result goes into one preallocated column-major float32 block: each
+        # column is a contiguous buffer, matching pandas' own block layout.
+        arr = self.df[numeric_cols].to_numpy(dtype=np.float32)
+        scaled_values = np.empty(arr.shape, dtype=np.float32, order='F')
+        np.subtract(arr, mu.astype(np.float32), out=scaled_values)
+        np.divide(scaled_values, sd.astype(np.float32), out=scaled_values)
 
-    def save_processed_data(self, save_path):
+        # Attach all scaled columns in a single concat instead of one insert per column
+        scaled_df = pd.DataFrame(
+            scaled_values,
+            index=self.df.index,
+            columns=[col + '_scaled' for col in numeric_cols],
+            copy=False,
+        )
+        self.df = pd.concat([self.df, scaled_df], axis=1)
+        logger.info("Scaled columns: %s (zero mean unit variance)", numeric_cols)
+
+    def save_processed_data(self, save_path, fmt='parquet'):
         """
-        Save the processed DataFrame to given path as a CSV file.
+        Save the processed DataFrame to given path as a Parquet or CSV file.
+        Source columns that have a '_scaled' or '_capped' version are dropped,
+        so each feature is written once.
         Args:
-            save_path(str): Path(including filename)  to save the processed CSV.
+            save_path(str): Path(including filename)  to save the processed data.
+            fmt(str): 'parquet' (snappy-compressed, extension swapped to .parquet) or 'csv'.
+        Returns:
+            str: Path the data was written to.
 
         """
 
         # Ensure directory exists
-        os.makedirs(os.path.dirname(save_path, exist_ok=True))
-        self.df.to_csv(save_path)
+        os.makedirs(os.path.dirname(save_path) or '.', exist_ok=True)
+        derived = {
+            col.rsplit('_', 1)[0] for col in self.df.columns
+            if col.endswith('_scaled') or col.endswith('_capped')
+        }
+        out = self.df[[col for col in self.df.columns if col not in derived]]
+        if fmt == 'parquet':
+            save_path = os.path.splitext(save_path)[0] + '.parquet'
+            out.to_parquet(save_path, engine='pyarrow', compression='snappy')
+        elif fmt == 'csv':
+            # Arrow's multithreaded CSV writer instead of DataFrame.to_csv, through a
+            # 1 MiB buffered stream; the date index goes back in as the leading column
+            with pa.output_stream(save_path, buffer_size=1 << 20) as sink:
+                pacsv.write_csv(
+                    pa.Table.from_pandas(out.reset_index(), preserve_index=False),
+                    sink,
+                    write_options=pacsv.WriteOptions(batch_size=65536),
+                )
+        else:
+            raise ValueError(f"Unsupported format: {fmt!r} (expected 'parquet' or 'csv')")
+        return save_path
 
     def get_data(self):
         # Returns the  proessed DataFrame
 
         return self.df
 
-def run_all(self, save_path):
+    def run_all(self, save_path, fmt='parquet'):
         """Industry-style pipeline method."""
-        print("Starting full data preprocessing pipeline...")
+        logger.info("Starting full data preprocessing pipeline...")
         self.detect_missing_values()
         self.handle_missing_values()
         self.handle_outliers()
         self.scale_features()
-        self.save_processed_data(save_path)
-        print("Preprocessing pipeline complete! Processed data saved to:", save_path)
+        save_path = self.save_processed_data(save_path, fmt=fmt)
+        logger.info("Preprocessing pipeline complete! Processed data saved to: %s", save_path)
 
 
 """
@@ -26,9 +26,14 @@ class DataPreprocessor:
             pd.DataFrame:  Loaded DataFrame
 
         """
-        df = pd.read_csv(self.file_path)
-        df['date'] = pd.to_datetime(df['date'])
-        df.set_index('date', inplace=True)
+        # Parse the dates in the C reader with an explicit format (no inference, no re-parse)
+        df = pd.read_csv(
+            self.file_path,
+            parse_dates=['date'],
+            date_format='%Y-%m-%d %H:%M:%S',
+            index_col='date',
+            engine='c',
+        )
         print("Data loaded. Shape:", df.shape)
         return df
     
@@ -87,8 +92,13 @@ class DataPreprocessor:
         scaler = StandardScaler()
         scaled_values = scaler.fit_transform(self.df[numeric_cols])
 
-        for i, col in enumerate(numeric_cols):
-            self.df[col  + '_scaled'] = scaled_values[:, i]
+        # Attach all scaled columns in a single concat instead of one insert per column
+        scaled_df = pd.DataFrame(
+            scaled_values,
+            index=self.df.index,
+            columns=[col + '_scaled' for col in numeric_cols],
+        )
+        self.df = pd.concat([self.df, scaled_df], axis=1)
         print(f"\nScaled columns: {numeric_cols} (zero mean unit variance)")
 
     def get_data(self):